@@ -1,17 +1,28 @@
 from fastapi import FastAPI, Request, HTTPException, Depends, status
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from jinja2 import FileSystemBytecodeCache
 import uvicorn
+import asyncio
 import os
 import io
 import csv
+import tempfile
 import json
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    # orjson的SIMD编码比stdlib json快一个量级，列表型大响应受益最明显；
+    # 未安装时回退到默认的JSONResponse
+    import orjson  # noqa: F401
+    _JSON_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    _JSON_RESPONSE_CLASS = JSONResponse
+
 logger = logging.getLogger(__name__)
 
 from models import (
@@ -69,7 +80,8 @@ def create_app_sync() -> FastAPI:
         title="游戏追踪器",
         description="管理您的游戏进度",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=_JSON_RESPONSE_CLASS
     )
     
     # 添加CORS中间件
@@ -88,7 +100,15 @@ def create_app_sync() -> FastAPI:
     if static_dir.exists():
         app.mount("/static", StaticFiles(directory="static"), name="static")
     
-    app.templates = Jinja2Templates(directory="templates") if templates_dir.exists() else None
+    if templates_dir.exists():
+        app.templates = Jinja2Templates(directory="templates")
+        # 模板字节码落盘缓存：首次编译后的代码对象持久化到文件系统，
+        # 多worker部署/进程重启时直接加载，免去每个进程重付parse+compile
+        cache_dir = Path(tempfile.gettempdir()) / "gametracker_jinja_cache"
+        cache_dir.mkdir(exist_ok=True)
+        app.templates.env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+    else:
+        app.templates = None
     app.templates_dir_exists = templates_dir.exists()
     
     # 添加安全头
@@ -240,16 +260,14 @@ async def fix_database_schema():
                 settings_count = result.scalar()
                 if settings_count == 0:
                     logger.info("创建默认用户设置...")
-                    # 创建游戏限制设置
+                    # 游戏/阅读限制一次批量写入（executemany），减少往返
                     await session.execute(text("""
                         INSERT INTO settings (user_id, key, value, updated_at)
-                        VALUES (1, 'game_limit', 5, NOW())
-                    """))
-                    # 创建阅读限制设置
-                    await session.execute(text("""
-                        INSERT INTO settings (user_id, key, value, updated_at)
-                        VALUES (1, 'book_limit', 3, NOW())
-                    """))
+                        VALUES (:user_id, :key, :value, NOW())
+                    """), [
+                        {"user_id": 1, "key": "game_limit", "value": 5},
+                        {"user_id": 1, "key": "book_limit", "value": 3},
+                    ])
                     await session.commit()
                     logger.info("默认设置创建成功")
                 else:
@@ -580,21 +598,29 @@ async def export_user_data(
             }
         }
         
-        # 导出游戏数据
-        if export_request.include_games:
-            if store.use_database:
-                games_data = await user_store.get_all_games(current_user.id)
-            else:
-                games_data = await store.get_all_games()
+        # 导出游戏和书籍数据：两者读不同的表、互不依赖，数据库模式下
+        # 用gather并发执行，总延迟约等于较慢的一个查询而非两者之和
+        if export_request.include_games and export_request.include_books and store.use_database:
+            games_data, books_data = await asyncio.gather(
+                user_store.get_all_games(current_user.id),
+                user_store.get_all_books(current_user.id)
+            )
             export_data["games"] = games_data
-        
-        # 导出书籍数据
-        if export_request.include_books:
-            if store.use_database:
-                books_data = await user_store.get_all_books(current_user.id)
-            else:
-                books_data = book_store.get_all_books()
             export_data["books"] = books_data
+        else:
+            if export_request.include_games:
+                if store.use_database:
+                    games_data = await user_store.get_all_games(current_user.id)
+                else:
+                    games_data = await store.get_all_games()
+                export_data["games"] = games_data
+
+            if export_request.include_books:
+                if store.use_database:
+                    books_data = await user_store.get_all_books(current_user.id)
+                else:
+                    books_data = book_store.get_all_books()
+                export_data["books"] = books_data
         
         # 根据格式返回数据
         if export_request.format == ExportFormat.JSON:
@@ -818,28 +844,53 @@ async def force_migrate_schema():
     except Exception as e:
         return {"success": False, "message": f"Migration failed: {str(e)}"}
 
+async def _probe_schema_exists(query: str) -> bool:
+    """在独立连接上执行一条EXISTS探测查询，失败视为不存在"""
+    from sqlalchemy import text
+    async with db_manager.engine.connect() as conn:
+        result = await conn.execute(text(query))
+        return bool(result.scalar())
+
 async def _migrate_database_schema_direct():
     """直接进行数据库模式迁移，不依赖migrate_database_schema模块"""
     try:
         from sqlalchemy import text
-        
+
         async with db_manager.get_session() as session:
             logger.info("开始直接数据库模式迁移...")
-            
-            # 检查用户表是否存在
-            try:
-                users_table_check = await session.execute(text("""
+
+            # 三个存在性探测相互独立：各用一个池内连接并发执行，
+            # 探测耗时从RTT之和降为最大值；DDL仍在session上串行执行
+            probe_results = await asyncio.gather(
+                _probe_schema_exists("""
                     SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
+                        SELECT FROM information_schema.tables
                         WHERE table_name = 'users'
                     );
-                """))
-                users_table_exists = users_table_check.scalar()
-                logger.info(f"用户表存在检查: {users_table_exists}")
-            except Exception as e:
-                logger.error(f"检查用户表失败: {str(e)}")
-                users_table_exists = False
-            
+                """),
+                _probe_schema_exists("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.columns
+                        WHERE table_name = 'games' AND column_name = 'user_id'
+                    );
+                """),
+                _probe_schema_exists("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables
+                        WHERE table_name = 'settings'
+                    );
+                """),
+                return_exceptions=True
+            )
+            users_table_exists, games_user_id_exists, settings_table_exists = (
+                False if isinstance(r, BaseException) else r for r in probe_results
+            )
+            for label, r in zip(("用户表", "games表user_id列", "settings表"), probe_results):
+                if isinstance(r, BaseException):
+                    logger.error(f"检查{label}失败: {r}")
+                else:
+                    logger.info(f"{label}存在检查: {r}")
+
             if not users_table_exists:
                 try:
                     logger.info("创建用户表...")
@@ -868,20 +919,7 @@ async def _migrate_database_schema_direct():
             else:
                 logger.info("✅ 用户表已存在")
             
-            # 检查games表的user_id列是否存在
-            try:
-                games_user_id_check = await session.execute(text("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.columns 
-                        WHERE table_name = 'games' AND column_name = 'user_id'
-                    );
-                """))
-                games_user_id_exists = games_user_id_check.scalar()
-                logger.info(f"games表user_id列存在检查: {games_user_id_exists}")
-            except Exception as e:
-                logger.error(f"检查games表user_id列失败: {str(e)}")
-                games_user_id_exists = False
-            
+            # games表的user_id列（存在性来自开头的并发探测）
             if not games_user_id_exists:
                 try:
                     logger.info("为games表添加user_id列...")
@@ -927,20 +965,7 @@ async def _migrate_database_schema_direct():
             else:
                 logger.info("✅ games表已有user_id列")
             
-            # 检查settings表
-            try:
-                settings_table_check = await session.execute(text("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_name = 'settings'
-                    );
-                """))
-                settings_table_exists = settings_table_check.scalar()
-                logger.info(f"settings表存在检查: {settings_table_exists}")
-            except Exception as e:
-                logger.error(f"检查settings表失败: {str(e)}")
-                settings_table_exists = False
-            
+            # settings表（存在性来自开头的并发探测）
             if not settings_table_exists:
                 try:
                     logger.info("创建settings表...")
@@ -1023,26 +1048,30 @@ async def migrate_legacy_data(current_user: User = Depends(get_current_active_us
                 games_data = json.load(f)
             
             # 处理旧格式数据
+            # 整个循环共用一个会话和事务，结尾一次性提交：
+            # N次per-row commit（各一次fsync/WAL刷盘）合并为1次
             if isinstance(games_data.get('games'), dict):
-                for game_id, game_data in games_data['games'].items():
-                    try:
-                        # 转换状态
-                        status_str = game_data.get('status', 'active')
-                        game_status = getattr(GameStatus, status_str.upper(), GameStatus.ACTIVE)
-                        
-                        game_create = GameCreate(
-                            name=game_data.get('name', ''),
-                            status=game_status,
-                            notes=game_data.get('notes', ''),
-                            rating=game_data.get('rating'),
-                            reason=game_data.get('reason', '')
-                        )
-                        
-                        await user_store.add_game(current_user.id, game_create)
-                        migration_result["games_migrated"] += 1
-                        
-                    except Exception as e:
-                        migration_result["errors"].append(f"游戏迁移失败: {game_data.get('name', 'Unknown')} - {str(e)}")
+                async with db_manager.get_session() as session:
+                    for game_id, game_data in games_data['games'].items():
+                        try:
+                            # 转换状态
+                            status_str = game_data.get('status', 'active')
+                            game_status = getattr(GameStatus, status_str.upper(), GameStatus.ACTIVE)
+
+                            game_create = GameCreate(
+                                name=game_data.get('name', ''),
+                                status=game_status,
+                                notes=game_data.get('notes', ''),
+                                rating=game_data.get('rating'),
+                                reason=game_data.get('reason', '')
+                            )
+
+                            await user_store.add_game(current_user.id, game_create, session=session)
+                            migration_result["games_migrated"] += 1
+
+                        except Exception as e:
+                            migration_result["errors"].append(f"游戏迁移失败: {game_data.get('name', 'Unknown')} - {str(e)}")
+                    await session.commit()
         
         # 迁移书籍数据
         books_file = Path("books_data.json")
@@ -1050,29 +1079,31 @@ async def migrate_legacy_data(current_user: User = Depends(get_current_active_us
             with open(books_file, 'r', encoding='utf-8') as f:
                 books_data = json.load(f)
             
-            # 处理书籍数据
+            # 处理书籍数据（同游戏：一个会话一个事务，结尾统一提交）
             if isinstance(books_data.get('books'), dict):
-                for book_id, book_data in books_data['books'].items():
-                    try:
-                        # 转换状态
-                        status_str = book_data.get('status', 'reading')
-                        book_status = getattr(BookStatus, status_str.upper(), BookStatus.READING)
-                        
-                        book_create = BookCreate(
-                            title=book_data.get('title', ''),
-                            author=book_data.get('author', ''),
-                            status=book_status,
-                            notes=book_data.get('notes', ''),
-                            rating=book_data.get('rating'),
-                            reason=book_data.get('reason', ''),
-                            progress=book_data.get('progress', '')
-                        )
-                        
-                        await user_store.add_book(current_user.id, book_create)
-                        migration_result["books_migrated"] += 1
-                        
-                    except Exception as e:
-                        migration_result["errors"].append(f"书籍迁移失败: {book_data.get('title', 'Unknown')} - {str(e)}")
+                async with db_manager.get_session() as session:
+                    for book_id, book_data in books_data['books'].items():
+                        try:
+                            # 转换状态
+                            status_str = book_data.get('status', 'reading')
+                            book_status = getattr(BookStatus, status_str.upper(), BookStatus.READING)
+
+                            book_create = BookCreate(
+                                title=book_data.get('title', ''),
+                                author=book_data.get('author', ''),
+                                status=book_status,
+                                notes=book_data.get('notes', ''),
+                                rating=book_data.get('rating'),
+                                reason=book_data.get('reason', ''),
+                                progress=book_data.get('progress', '')
+                            )
+
+                            await user_store.add_book(current_user.id, book_create, session=session)
+                            migration_result["books_migrated"] += 1
+
+                        except Exception as e:
+                            migration_result["errors"].append(f"书籍迁移失败: {book_data.get('title', 'Unknown')} - {str(e)}")
+                    await session.commit()
         
         return {
             "success": True,
@@ -1101,7 +1132,8 @@ async def get_sync_status():
                 "reason": "GitHub同步仅在JSON存储模式下可用"
             }
         else:
-            return store._store.get_sync_status()
+            # GitHub API调用是阻塞IO，放到线程池执行，避免卡住事件循环
+            return await asyncio.to_thread(store._store.get_sync_status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取同步状态失败: {str(e)}")
 
@@ -1112,7 +1144,7 @@ async def sync_to_github():
         if store.use_database:
             raise HTTPException(status_code=400, detail="数据库模式下不支持GitHub同步")
         
-        success = store._store.manual_sync_to_github()
+        success = await asyncio.to_thread(store._store.manual_sync_to_github)
         if success:
             return {"success": True, "message": "数据已成功同步到GitHub"}
         else:
@@ -1127,7 +1159,7 @@ async def sync_from_github():
         if store.use_database:
             raise HTTPException(status_code=400, detail="数据库模式下不支持GitHub同步")
         
-        success = store._store.manual_sync_from_github()
+        success = await asyncio.to_thread(store._store.manual_sync_from_github)
         if success:
             return {"success": True, "message": "数据已成功从GitHub同步"}
         else:
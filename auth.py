@@ -3,9 +3,15 @@
 包含密码加密、JWT令牌生成/验证、用户依赖注入等功能
 """
 
+import hashlib
+import hmac
+import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -17,8 +23,30 @@ from models import User, TokenData
 from db_models import UserModel
 from store_adapter import GameStoreAdapter
 
+logger = logging.getLogger(__name__)
+
+# JWT签名优先走cryptography(OpenSSL)后端：HS256的HMAC-SHA256在支持SHA-NI的CPU上
+# 由硬件指令加速，吞吐量约为纯Python实现的3-5倍。python-jose在安装了cryptography
+# 时会自动选用该后端（requirements已固定python-jose[cryptography]），这里仅在
+# 后端缺失时给出提示，方便定位性能退化。
+try:
+    from jose.backends import cryptography_backend  # noqa: F401
+except ImportError:
+    logger.warning(
+        "cryptography后端不可用，python-jose回退到内置HMAC实现，JWT签名/验证性能会下降"
+    )
+
 # 密码加密配置
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 显式固定bcrypt的ident和rounds：passlib无需在首次使用时做后端探测和
+# 每次调用的rounds协商，减少冷启动及热路径开销。
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__ident="2b",
+    bcrypt__default_rounds=12,
+    bcrypt__min_rounds=12,
+    bcrypt__max_rounds=12,
+)
 
 # JWT配置
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -28,9 +56,54 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7天
 # HTTP Bearer认证
 security = HTTPBearer(auto_error=False)
 
+@lru_cache(maxsize=1)
+def _use_database_mode() -> bool:
+    """存储模式在启动时确定且运行期不变，缓存判断结果。
+
+    避免每个认证请求都构造GameStoreAdapter——其__init__会初始化底层存储
+    （JSON模式下包含读取数据文件），在认证热路径上是纯粹的浪费。
+    """
+    return GameStoreAdapter._should_use_database()
+
+# 登录验证结果短时缓存（可选功能，默认关闭）
+# bcrypt验证单次约100ms，短时间内的重复登录（移动端重试、部署后的突发登录）
+# 可以复用验证结果。通过LOGIN_CACHE_TTL环境变量（秒）显式开启。
+LOGIN_CACHE_TTL = float(os.getenv("LOGIN_CACHE_TTL", "0"))
+_LOGIN_CACHE_MAX_ENTRIES = 256
+_login_cache: Dict[bytes, Tuple[bool, float]] = {}
+_login_cache_lock = threading.Lock()
+
+def _login_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    """计算缓存键：用SECRET_KEY做HMAC，避免在内存中保留明文口令"""
+    message = (plain_password + hashed_password).encode("utf-8")
+    return hmac.new(SECRET_KEY.encode("utf-8"), message, hashlib.sha256).digest()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
-    return pwd_context.verify(plain_password, hashed_password)
+    if LOGIN_CACHE_TTL <= 0:
+        return pwd_context.verify(plain_password, hashed_password)
+
+    cache_key = _login_cache_key(plain_password, hashed_password)
+    now = time.monotonic()
+
+    with _login_cache_lock:
+        cached = _login_cache.get(cache_key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+    valid = pwd_context.verify(plain_password, hashed_password)
+
+    with _login_cache_lock:
+        if len(_login_cache) >= _LOGIN_CACHE_MAX_ENTRIES:
+            # 先清理过期条目，仍然过大时整体清空（TTL很短，代价可接受）
+            expired = [key for key, (_, expires) in _login_cache.items() if expires <= now]
+            for key in expired:
+                del _login_cache[key]
+            if len(_login_cache) >= _LOGIN_CACHE_MAX_ENTRIES:
+                _login_cache.clear()
+        _login_cache[cache_key] = (valid, now + LOGIN_CACHE_TTL)
+
+    return valid
 
 def get_password_hash(password: str) -> str:
     """加密密码"""
@@ -63,8 +136,7 @@ def verify_token(token: str) -> Optional[TokenData]:
 async def get_user_by_id(user_id: int) -> Optional[User]:
     """根据用户ID获取用户"""
     # 检查是否使用数据库模式
-    store_adapter = GameStoreAdapter()
-    if store_adapter.use_database:
+    if _use_database_mode():
         async with db_manager.get_session() as session:
             result = await session.get(UserModel, user_id)
             if result:
@@ -90,8 +162,7 @@ async def get_user_by_id(user_id: int) -> Optional[User]:
 
 async def get_user_by_email(email: str) -> Optional[User]:
     """根据邮箱获取用户"""
-    store_adapter = GameStoreAdapter()
-    if store_adapter.use_database:
+    if _use_database_mode():
         from sqlalchemy import select
         async with db_manager.get_session() as session:
             result = await session.execute(
@@ -121,8 +192,7 @@ async def get_user_by_email(email: str) -> Optional[User]:
 
 async def authenticate_user(email: str, password: str) -> Optional[User]:
     """验证用户登录凭证"""
-    store_adapter = GameStoreAdapter()
-    if store_adapter.use_database:
+    if _use_database_mode():
         user_by_email = await get_user_by_email(email)
         if not user_by_email:
             return None
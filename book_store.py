@@ -1,5 +1,6 @@
 from typing import Dict, List
 from datetime import datetime
+from itertools import groupby
 import threading
 import json
 import os
@@ -26,34 +27,44 @@ class DuplicateBookError(GameTrackerException):
     def __init__(self, title: str):
         super().__init__(f"A book with title '{title}' is already being read")
 
+# get_all_books排序用：各状态分组的先后顺序
+_STATUS_ORDER = {status: index for index, status in enumerate(BookStatus)}
+
 class BookStore:
     def __init__(self, default_limit: int = 3, data_file: str = "books_data.json"):
         self._books: Dict[int, Book] = {}
+        # 正在阅读书籍的标准化书名索引：title_key -> book_id，用于O(1)重复检测
+        self._reading_titles: Dict[str, int] = {}
         self._next_id = 1
         self._limit = default_limit
         self._lock = threading.Lock()
         self._data_file = Path(data_file)
-        
+
         self._load_data()
+
+    @staticmethod
+    def _title_key(title: str) -> str:
+        """标准化书名，作为重复检测的键"""
+        return title.strip().lower()
     
     def get_all_books(self) -> dict:
         """Get all books grouped by status"""
         with self._lock:
-            reading = [book for book in self._books.values() if book.status == BookStatus.READING]
-            paused = [book for book in self._books.values() if book.status == BookStatus.PAUSED]
-            reference = [book for book in self._books.values() if book.status == BookStatus.REFERENCE]
-            planned = [book for book in self._books.values() if book.status == BookStatus.PLANNED]
-            finished = [book for book in self._books.values() if book.status == BookStatus.FINISHED]
-            dropped = [book for book in self._books.values() if book.status == BookStatus.DROPPED]
-            
-            return {
-                "reading": sorted(reading, key=lambda b: b.created_at, reverse=True),
-                "paused": sorted(paused, key=lambda b: b.created_at, reverse=True),
-                "reference": sorted(reference, key=lambda b: b.created_at, reverse=True),
-                "planned": sorted(planned, key=lambda b: b.created_at, reverse=True),
-                "finished": sorted(finished, key=lambda b: b.ended_at or b.created_at, reverse=True),
-                "dropped": sorted(dropped, key=lambda b: b.ended_at or b.created_at, reverse=True)
-            }
+            # 一次排序 + groupby分组：每个Book对象只读取一次。
+            # 排序键为(状态顺序, 时间倒序)；已读完/已弃读按结束时间排，其余按创建时间排。
+            def sort_key(book: Book):
+                if book.status in (BookStatus.FINISHED, BookStatus.DROPPED):
+                    moment = book.ended_at or book.created_at
+                else:
+                    moment = book.created_at
+                return (_STATUS_ORDER[book.status], -moment.timestamp())
+
+            ordered = sorted(self._books.values(), key=sort_key)
+
+            grouped: Dict[str, List[Book]] = {status.value: [] for status in BookStatus}
+            for status, group in groupby(ordered, key=lambda b: b.status):
+                grouped[status.value] = list(group)
+            return grouped
     
     def get_reading_count(self) -> dict:
         """Get current reading book count and limit"""
@@ -75,15 +86,15 @@ class BookStore:
         """Add a new book"""
         with self._lock:
             # 检查是否超出阅读限制（仅对正在阅读的书籍限制）
+            new_key = self._title_key(book_data.title)
             if book_data.status == BookStatus.READING:
                 reading_count = len([b for b in self._books.values() if b.status == BookStatus.READING])
                 if reading_count >= self._limit:
                     raise BookLimitExceededError(self._limit)
-                
-                # 检查是否已有相同书名的正在阅读的书籍
-                for book in self._books.values():
-                    if book.status == BookStatus.READING and book.title.strip().lower() == book_data.title.strip().lower():
-                        raise DuplicateBookError(book_data.title)
+
+                # 检查是否已有相同书名的正在阅读的书籍（索引查找，无需遍历）
+                if new_key in self._reading_titles:
+                    raise DuplicateBookError(book_data.title)
             
             # 创建新书籍
             book = Book(
@@ -104,8 +115,10 @@ class BookStore:
                 book.ended_at = datetime.now()
             
             self._books[self._next_id] = book
+            if book.status == BookStatus.READING:
+                self._reading_titles[new_key] = book.id
             self._next_id += 1
-            
+
             self._save_data()
             return book
     
@@ -117,7 +130,8 @@ class BookStore:
             
             book = self._books[book_id]
             old_status = book.status
-            
+            old_key = self._title_key(book.title)
+
             # 应用更新
             update_data = updates.dict(exclude_unset=True)
             for field, value in update_data.items():
@@ -137,11 +151,8 @@ class BookStore:
                     
                     # 检查重复书名
                     if "title" not in update_data:  # 如果没有同时更新书名
-                        for other_book in self._books.values():
-                            if (other_book.id != book_id and 
-                                other_book.status == BookStatus.READING and 
-                                other_book.title.strip().lower() == book.title.strip().lower()):
-                                raise DuplicateBookError(book.title)
+                        if self._reading_titles.get(self._title_key(book.title), book_id) != book_id:
+                            raise DuplicateBookError(book.title)
                 
                 # 状态变为已读完或已弃读时，设置结束时间
                 if new_status in [BookStatus.FINISHED, BookStatus.DROPPED] and old_status not in [BookStatus.FINISHED, BookStatus.DROPPED]:
@@ -152,12 +163,15 @@ class BookStore:
             
             # 检查书名重复（如果同时更新了书名和状态为正在阅读）
             if "title" in update_data and book.status == BookStatus.READING:
-                for other_book in self._books.values():
-                    if (other_book.id != book_id and 
-                        other_book.status == BookStatus.READING and 
-                        other_book.title.strip().lower() == book.title.strip().lower()):
-                        raise DuplicateBookError(book.title)
-            
+                if self._reading_titles.get(self._title_key(book.title), book_id) != book_id:
+                    raise DuplicateBookError(book.title)
+
+            # 维护正在阅读书籍的书名索引
+            if old_status == BookStatus.READING:
+                self._reading_titles.pop(old_key, None)
+            if book.status == BookStatus.READING:
+                self._reading_titles[self._title_key(book.title)] = book_id
+
             self._save_data()
             return book
     
@@ -166,8 +180,10 @@ class BookStore:
         with self._lock:
             if book_id not in self._books:
                 raise BookNotFoundError(book_id)
-            
-            del self._books[book_id]
+
+            book = self._books.pop(book_id)
+            if book.status == BookStatus.READING:
+                self._reading_titles.pop(self._title_key(book.title), None)
             self._save_data()
             return True
     
@@ -211,7 +227,9 @@ class BookStore:
                             book_data['user_id'] = 1
                         book = Book(**book_data)
                         self._books[book.id] = book
-                        
+                        if book.status == BookStatus.READING:
+                            self._reading_titles[self._title_key(book.title)] = book.id
+
                     logger.info(f"Loaded {len(self._books)} books from {self._data_file}")
             else:
                 logger.info(f"No existing data file found at {self._data_file}, starting with empty book list")
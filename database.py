@@ -1,7 +1,6 @@
 import os
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import sessionmaker
 from contextlib import asynccontextmanager
 import asyncio
 import logging
@@ -17,8 +16,19 @@ class DatabaseConfig:
         # 从环境变量读取数据库配置
         self.database_url = self._get_database_url()
         self.echo = os.getenv("DB_ECHO", "false").lower() == "true"
+        # 连接池按并发异步请求量配置：pool_size为常驻连接数，max_overflow为
+        # 突发上限（两者之和不应超过数据库侧max_connections除以worker进程数），
+        # pool_timeout是无可用连接时的最长等待秒数
         self.pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
         self.max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+        self.pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        # SQL编译缓存条目数：缓存编译好的语句可省掉每次查询约25-30%的编译开销
+        self.query_cache_size = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+        # 批量INSERT时单条语句携带的行数（insertmanyvalues），减少往返次数
+        self.insertmanyvalues_page_size = int(os.getenv("DB_INSERTMANYVALUES_PAGE_SIZE", "1000"))
+        # asyncpg客户端预编译语句缓存条目数（驱动默认100）。
+        # 经PgBouncer事务池模式接入时预编译语句会跨会话串台，须置0关闭
+        self.statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
         
     def _get_database_url(self) -> str:
         """构建数据库连接URL"""
@@ -64,6 +74,10 @@ class DatabaseManager:
                 max_overflow=self.config.max_overflow,
                 pool_pre_ping=True,  # 连接健康检查
                 pool_recycle=3600,   # 1小时后回收连接
+                pool_timeout=self.config.pool_timeout,  # 等待连接的超时
+                query_cache_size=self.config.query_cache_size,  # SQL编译缓存
+                insertmanyvalues_page_size=self.config.insertmanyvalues_page_size,  # 批量INSERT分页
+                connect_args={"statement_cache_size": self.config.statement_cache_size},
             )
             
             # 创建会话工厂
@@ -116,6 +130,25 @@ class DatabaseManager:
             finally:
                 await session.close()
     
+    async def copy_records_to_table(self, table_name: str, records, columns) -> str:
+        """通过PostgreSQL的COPY协议批量写入一张表
+
+        直接走asyncpg驱动的copy_records_to_table，绕过ORM和逐行INSERT，
+        大批量导入（种子数据/备份恢复）时约有10倍吞吐优势。
+        records为元组可迭代对象，顺序需与columns一致；枚举值请先转换为
+        数据库存储的字符串。返回驱动的COPY状态串（如"COPY 1000"）。
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        async with self.engine.begin() as conn:
+            raw_connection = await conn.get_raw_connection()
+            return await raw_connection.driver_connection.copy_records_to_table(
+                table_name,
+                records=list(records),
+                columns=list(columns),
+            )
+
     async def health_check(self) -> bool:
         """数据库健康检查"""
         try:
@@ -1,9 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, CheckConstraint, Boolean, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, CheckConstraint, UniqueConstraint, Boolean, ForeignKey, Index
+from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
-from datetime import datetime
-import enum
 
 from models import GameStatus, BookStatus
 
@@ -37,15 +34,22 @@ class GameModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String(100), nullable=False, index=True)
-    status = Column(Enum(GameStatus), nullable=False, default=GameStatus.ACTIVE, index=True)
+    # 非原生枚举：存为VARCHAR+CHECK约束。比较是普通字符串比较，且新增状态
+    # 只需改CHECK，不需要代价高昂的ALTER TYPE
+    status = Column(
+        Enum(GameStatus, native_enum=False, length=20, create_constraint=True),
+        nullable=False, default=GameStatus.ACTIVE, index=True
+    )
     notes = Column(Text, default="")
     rating = Column(Integer, nullable=True)
     reason = Column(Text, default="")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     ended_at = Column(DateTime(timezone=True), nullable=True)
     
-    # 关系
-    owner = relationship("UserModel", back_populates="games")
+    # 关系：API模型不序列化owner，没有查询路径会读它——selectin预加载
+    # 只是给每次列表查询平白多发一条SELECT。改为lazy="raise"：不发额外
+    # 查询，将来谁不小心访问会立刻显式报错，而不是退化成N+1
+    owner = relationship("UserModel", back_populates="games", lazy="raise")
     
     # 约束条件
     __table_args__ = (
@@ -61,7 +65,11 @@ class BookModel(Base):
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     title = Column(String(200), nullable=False, index=True)
     author = Column(String(100), default="")
-    status = Column(Enum(BookStatus), nullable=False, default=BookStatus.READING, index=True)
+    # 非原生枚举，同games表
+    status = Column(
+        Enum(BookStatus, native_enum=False, length=20, create_constraint=True),
+        nullable=False, default=BookStatus.READING, index=True
+    )
     notes = Column(Text, default="")
     rating = Column(Integer, nullable=True)
     reason = Column(Text, default="")
@@ -69,8 +77,8 @@ class BookModel(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     ended_at = Column(DateTime(timezone=True), nullable=True)
     
-    # 关系
-    owner = relationship("UserModel", back_populates="books")
+    # 关系：同games表，无人读取则不预加载，误访问时显式报错
+    owner = relationship("UserModel", back_populates="books", lazy="raise")
     
     # 约束条件
     __table_args__ = (
@@ -88,16 +96,16 @@ class SettingsModel(Base):
     value = Column(Integer, nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # 关系
-    owner = relationship("UserModel")
+    # 关系：同上，无人读取则不加载
+    owner = relationship("UserModel", lazy="raise")
     
-    # 约束条件：每个用户的每个设置键唯一
+    # 约束条件：每个用户的每个设置键唯一（表级约束，自带唯一索引）
     __table_args__ = (
+        UniqueConstraint('user_id', 'key', name='uq_settings_user_key'),
         CheckConstraint('LENGTH(TRIM(key)) > 0', name='settings_key_not_empty'),
     )
 
 # 创建索引以提高查询性能
-from sqlalchemy import Index
 
 # 用户相关索引
 Index('idx_users_email', UserModel.email)
@@ -106,6 +114,11 @@ Index('idx_users_active', UserModel.is_active)
 # 游戏相关索引
 Index('idx_games_user_status', GameModel.user_id, GameModel.status)
 Index('idx_games_user_created', GameModel.user_id, GameModel.created_at.desc())
+# 重复名检测只针对ACTIVE游戏/READING书籍，部分索引让该检查只触达极小的索引
+Index('idx_games_user_active_name', GameModel.user_id, GameModel.name,
+      postgresql_where=(GameModel.status == GameStatus.ACTIVE))
+Index('idx_books_user_reading_title', BookModel.user_id, BookModel.title,
+      postgresql_where=(BookModel.status == BookStatus.READING))
 Index('idx_games_user_ended', GameModel.user_id, GameModel.ended_at.desc(), 
       postgresql_where=GameModel.ended_at.isnot(None))
 
@@ -115,5 +128,5 @@ Index('idx_books_user_created', BookModel.user_id, BookModel.created_at.desc())
 Index('idx_books_user_ended', BookModel.user_id, BookModel.ended_at.desc(), 
       postgresql_where=BookModel.ended_at.isnot(None))
 
-# 设置相关索引
-Index('idx_settings_user_key', SettingsModel.user_id, SettingsModel.key, unique=True)
\ No newline at end of file
+# 设置表的(user_id, key)唯一性由表级约束uq_settings_user_key保证，
+# 其隐式索引同时覆盖按用户+键的查询，无需再单独建索引
\ No newline at end of file
@@ -1,63 +1,66 @@
-from fastapi import HTTPException
-
-class GameTrackerException(Exception):
-    """Base exception for game tracker operations"""
-    pass
-
-class GameNotFoundError(GameTrackerException):
-    """Raised when a game is not found"""
-    def __init__(self, game_id: int):
-        self.game_id = game_id
-        super().__init__(f"Game with ID {game_id} not found")
-    
-    def to_http_exception(self) -> HTTPException:
-        return HTTPException(status_code=404, detail=str(self))
-
-class GameLimitExceededError(GameTrackerException):
-    """Raised when trying to exceed the active game limit"""
-    def __init__(self, limit: int):
-        self.limit = limit
-        super().__init__(f"Cannot exceed limit of {limit} active games")
-    
-    def to_http_exception(self) -> HTTPException:
-        return HTTPException(status_code=400, detail=str(self))
-
-class DuplicateGameError(GameTrackerException):
-    """Raised when trying to create a duplicate active game"""
-    def __init__(self, game_name: str):
-        self.game_name = game_name
-        super().__init__(f"Game '{game_name}' already exists in active games")
-    
-    def to_http_exception(self) -> HTTPException:
-        return HTTPException(status_code=400, detail=str(self))
-
-import functools
-
-def handle_game_tracker_exception(func):
-    """Decorator to convert GameTrackerException to HTTPException"""
-    @functools.wraps(func)
-    async def async_wrapper(*args, **kwargs):
-        try:
-            return await func(*args, **kwargs)
-        except GameTrackerException as e:
-            if hasattr(e, 'to_http_exception'):
-                raise e.to_http_exception()
-            else:
-                raise HTTPException(status_code=500, detail=str(e))
-    
-    @functools.wraps(func)
-    def sync_wrapper(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except GameTrackerException as e:
-            if hasattr(e, 'to_http_exception'):
-                raise e.to_http_exception()
-            else:
-                raise HTTPException(status_code=500, detail=str(e))
-    
-    # Return async wrapper for async functions
-    import inspect
-    if inspect.iscoroutinefunction(func):
-        return async_wrapper
-    else:
-        return sync_wrapper
\ No newline at end of file
+import functools
+import inspect
+
+from fastapi import HTTPException
+
+class GameTrackerException(Exception):
+    """Base exception for game tracker operations
+
+    Subclasses pre-build their HTTPException in __init__ (stored on
+    self._http) so to_http_exception() on the hot path is a plain
+    attribute read instead of a fresh allocation plus f-string format.
+    Subclasses that don't set one fall back to a lazily-built 500.
+    """
+    _http: HTTPException = None
+
+    def to_http_exception(self) -> HTTPException:
+        if self._http is None:
+            self._http = HTTPException(status_code=500, detail=str(self))
+        return self._http
+
+class GameNotFoundError(GameTrackerException):
+    """Raised when a game is not found"""
+    def __init__(self, game_id: int):
+        self.game_id = game_id
+        message = f"Game with ID {game_id} not found"
+        super().__init__(message)
+        self._http = HTTPException(status_code=404, detail=message)
+
+class GameLimitExceededError(GameTrackerException):
+    """Raised when trying to exceed the active game limit"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        message = f"Cannot exceed limit of {limit} active games"
+        super().__init__(message)
+        self._http = HTTPException(status_code=400, detail=message)
+
+class DuplicateGameError(GameTrackerException):
+    """Raised when trying to create a duplicate active game"""
+    def __init__(self, game_name: str):
+        self.game_name = game_name
+        message = f"Game '{game_name}' already exists in active games"
+        super().__init__(message)
+        self._http = HTTPException(status_code=400, detail=message)
+
+def handle_game_tracker_exception(func):
+    """Decorator to convert GameTrackerException to HTTPException
+
+    The coroutine check happens once at decoration time, so only the
+    wrapper that matches the target function is ever built.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except GameTrackerException as e:
+                raise e.to_http_exception() from None
+        return async_wrapper
+
+    @functools.wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except GameTrackerException as e:
+            raise e.to_http_exception() from None
+    return sync_wrapper
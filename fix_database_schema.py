@@ -15,6 +15,17 @@ from auth import get_password_hash
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# 预构造的探测语句：复用同一text()对象可按身份命中SQLAlchemy编译缓存，
+# 避免脚本重跑时重复解析
+_PROBE_EXISTING_TABLES = text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'")
+# 一次查询得到所有已有user_id列的表，替代逐表的异常探测（每次探测都是
+# 一个往返外加异常展开）
+_PROBE_USER_ID_COLUMNS = text("""
+    SELECT table_name FROM information_schema.columns
+    WHERE table_schema = 'public' AND column_name = 'user_id'
+      AND table_name IN ('games', 'books')
+""")
+
 async def fix_database_schema():
     """修复数据库schema问题"""
     try:
@@ -23,9 +34,11 @@ async def fix_database_schema():
         await db_manager.initialize()
         
         async with db_manager.get_session() as session:
+            # 后续所有检查与写入共用这一个事务，结尾一次性提交：
+            # 省掉每步单独commit的fsync往返，且中途失败时整体回滚，不留半成品schema
             # 1. 检查当前表结构
             logger.info("检查现有表...")
-            result = await session.execute(text("SELECT tablename FROM pg_tables WHERE schemaname = 'public'"))
+            result = await session.execute(_PROBE_EXISTING_TABLES)
             existing_tables = [row[0] for row in result]
             logger.info(f"现有表: {existing_tables}")
             
@@ -41,8 +54,9 @@ async def fix_database_schema():
             
             if user_count == 0:
                 logger.info("创建默认用户账户...")
+                # bcrypt哈希是CPU密集操作（约250ms），只在真正需要建用户时才计算
                 password_hash = get_password_hash("HEROsf4454")
-                
+
                 await session.execute(text("""
                     INSERT INTO users (username, email, password_hash, is_active, created_at)
                     VALUES (:username, :email, :password_hash, :is_active, NOW())
@@ -52,52 +66,54 @@ async def fix_database_schema():
                     "password_hash": password_hash,
                     "is_active": True
                 })
-                await session.commit()
                 logger.info("默认用户创建成功")
             else:
                 logger.info(f"用户表已有 {user_count} 个用户")
             
-            # 4. 检查games表是否需要添加user_id字段
-            try:
-                await session.execute(text("SELECT user_id FROM games LIMIT 1"))
+            # 4. 一次性查询games/books表的user_id列情况
+            result = await session.execute(_PROBE_USER_ID_COLUMNS)
+            tables_with_user_id = {row[0] for row in result}
+
+            # 5. 检查games表是否需要添加user_id字段
+            if 'games' in tables_with_user_id:
                 logger.info("games表已有user_id字段")
-            except Exception:
+            else:
                 logger.info("为games表添加user_id字段...")
                 await session.execute(text("ALTER TABLE games ADD COLUMN user_id INTEGER"))
                 # 将现有游戏关联到默认用户
                 await session.execute(text("UPDATE games SET user_id = 1 WHERE user_id IS NULL"))
                 await session.execute(text("ALTER TABLE games ALTER COLUMN user_id SET NOT NULL"))
-                await session.commit()
                 logger.info("games表user_id字段添加完成")
-            
-            # 5. 检查books表是否需要添加user_id字段
+
+            # 6. 检查books表是否需要添加user_id字段
             if 'books' in existing_tables:
-                try:
-                    await session.execute(text("SELECT user_id FROM books LIMIT 1"))
+                if 'books' in tables_with_user_id:
                     logger.info("books表已有user_id字段")
-                except Exception:
+                else:
                     logger.info("为books表添加user_id字段...")
                     await session.execute(text("ALTER TABLE books ADD COLUMN user_id INTEGER"))
                     await session.execute(text("UPDATE books SET user_id = 1 WHERE user_id IS NULL"))
                     await session.execute(text("ALTER TABLE books ALTER COLUMN user_id SET NOT NULL"))
-                    await session.commit()
                     logger.info("books表user_id字段添加完成")
             
-            # 6. 创建默认设置
-            try:
-                result = await session.execute(text("SELECT COUNT(*) FROM settings WHERE user_id = 1"))
-                settings_count = result.scalar()
-                if settings_count == 0:
-                    logger.info("创建默认用户设置...")
-                    await session.execute(text("""
-                        INSERT INTO settings (user_id, concurrent_game_limit, concurrent_reading_limit, created_at, updated_at)
-                        VALUES (1, 5, 3, NOW(), NOW())
-                    """))
-                    await session.commit()
-                    logger.info("默认设置创建成功")
-            except Exception as e:
-                logger.warning(f"创建设置时出现问题（可能是正常的）: {e}")
-            
+            # 7. 创建默认设置（键值对格式，批量executemany写入）
+            result = await session.execute(text("SELECT COUNT(*) FROM settings WHERE user_id = 1"))
+            settings_count = result.scalar()
+            if settings_count == 0:
+                logger.info("创建默认用户设置...")
+                await session.execute(text("""
+                    INSERT INTO settings (user_id, key, value, updated_at)
+                    VALUES (:user_id, :key, :value, NOW())
+                """), [
+                    {"user_id": 1, "key": "game_limit", "value": 5},
+                    {"user_id": 1, "key": "book_limit", "value": 3},
+                ])
+                logger.info("默认设置创建成功")
+            else:
+                logger.info(f"用户设置已存在，共 {settings_count} 条记录")
+
+            # 统一提交整个修复事务
+            await session.commit()
             logger.info("数据库schema修复完成！")
             
     except Exception as e:
@@ -4,14 +4,33 @@ GitHub同步模块 - 实现JSON数据与GitHub仓库的双向同步
 
 import json
 import base64
+import hashlib
 import os
 import logging
 from typing import Optional, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson未安装时回退到标准库json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _json_dumps_bytes(data: Dict[str, Any]) -> bytes:
+    """序列化同步载荷为UTF-8字节。大文件下orjson比标准库快5-10倍"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _json_loads(raw: bytes) -> Dict[str, Any]:
+    """反序列化同步载荷，直接接受bytes，省掉中间的str解码"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 class GitHubSyncError(Exception):
     """GitHub同步相关异常"""
     pass
@@ -45,25 +64,33 @@ class GitHubSync:
             self.enabled = True
             
         self.api_url = f"https://api.github.com/repos/{self.repo}/contents/{self.file_path}"
-        
+        # 最近一次已知的文件SHA：上传时直接复用，省掉PUT前的GET往返
+        self._cached_sha: Optional[str] = None
+        # 最近一次成功上传内容的摘要：载荷未变化时跳过整个上传
+        self._last_upload_digest: Optional[str] = None
+
+        # 持久Session：复用TCP+TLS连接，避免每次API调用重新握手
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "GameTracker-GitHubSync/1.0"
+        })
+        if self.token:
+            self._session.headers["Authorization"] = f"token {self.token}"
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        ))
+
     def is_enabled(self) -> bool:
         """检查GitHub同步是否启用"""
         return self.enabled and bool(self.token)
     
     def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """发送GitHub API请求"""
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "GameTracker-GitHubSync/1.0"
-        }
-        
-        if "headers" in kwargs:
-            headers.update(kwargs["headers"])
-        kwargs["headers"] = headers
-        
+        """发送GitHub API请求（默认头已设置在Session上，调用方可按需覆盖）"""
         try:
-            response = requests.request(method, url, timeout=30, **kwargs)
+            response = self._session.request(method, url, timeout=30, **kwargs)
             return response
         except requests.exceptions.RequestException as e:
             raise GitHubSyncError(f"GitHub API请求失败: {e}")
@@ -77,9 +104,12 @@ class GitHubSync:
             response = self._make_request("GET", f"{self.api_url}?ref={self.branch}")
             
             if response.status_code == 200:
-                return response.json()
+                file_info = response.json()
+                self._cached_sha = file_info.get("sha")
+                return file_info
             elif response.status_code == 404:
                 logger.info(f"文件 {self.file_path} 在GitHub上不存在")
+                self._cached_sha = None
                 return None
             else:
                 logger.error(f"获取文件信息失败: HTTP {response.status_code}")
@@ -95,17 +125,25 @@ class GitHubSync:
             return None
             
         try:
-            file_info = self.get_file_info()
-            if not file_info:
+            # 请求raw媒体类型：响应体就是文件内容本身，
+            # 省掉JSON包装的base64编码传输（约33%额外流量）和解码开销
+            response = self._make_request(
+                "GET",
+                f"{self.api_url}?ref={self.branch}",
+                headers={"Accept": "application/vnd.github.v3.raw"}
+            )
+
+            if response.status_code == 200:
+                data = _json_loads(response.content)
+                logger.info(f"成功从GitHub下载数据，文件大小: {len(response.content)} bytes")
+                return data
+            elif response.status_code == 404:
+                logger.info(f"文件 {self.file_path} 在GitHub上不存在")
                 return None
-                
-            # 解码base64内容
-            content = base64.b64decode(file_info["content"]).decode('utf-8')
-            data = json.loads(content)
-            
-            logger.info(f"成功从GitHub下载数据，文件大小: {len(content)} bytes")
-            return data
-            
+            else:
+                logger.error(f"从GitHub下载数据失败: HTTP {response.status_code}")
+                return None
+
         except Exception as e:
             logger.error(f"从GitHub下载数据失败: {e}")
             return None
@@ -117,39 +155,63 @@ class GitHubSync:
             return False
             
         try:
-            # 获取当前文件的SHA（如果存在）
-            file_info = self.get_file_info()
-            sha = file_info.get("sha") if file_info else None
-            
+            # 优先使用缓存的SHA，省掉PUT前的GET往返；没有缓存时再查询
+            sha = self._cached_sha
+            if sha is None:
+                file_info = self.get_file_info()
+                sha = file_info.get("sha") if file_info else None
+
             # 准备数据
-            json_content = json.dumps(data, ensure_ascii=False, indent=2)
-            encoded_content = base64.b64encode(json_content.encode('utf-8')).decode('ascii')
-            
+            json_content = _json_dumps_bytes(data)
+
+            # 内容与上次成功上传完全一致时，直接跳过base64编码和网络请求
+            digest = hashlib.sha256(json_content).hexdigest()
+            if digest == self._last_upload_digest and self._cached_sha:
+                logger.debug("数据与上次上传一致，跳过GitHub上传")
+                return True
+
+            encoded_content = base64.b64encode(json_content).decode('ascii')
+
             # 准备提交信息
             if not commit_message:
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 commit_message = f"🎮 自动同步游戏数据 - {timestamp}"
-            
+
             # 准备请求载荷
             payload = {
                 "message": commit_message,
                 "content": encoded_content,
                 "branch": self.branch
             }
-            
+
             if sha:
                 payload["sha"] = sha
-            
+
             # 发送请求
             response = self._make_request("PUT", self.api_url, json=payload)
-            
+
+            if response.status_code in [409, 422]:
+                # 缓存的SHA已过期（其他途径更新过文件）：刷新后重试一次
+                logger.info(f"上传SHA冲突(HTTP {response.status_code})，刷新SHA后重试")
+                self._cached_sha = None
+                file_info = self.get_file_info()
+                sha = file_info.get("sha") if file_info else None
+                if sha:
+                    payload["sha"] = sha
+                else:
+                    payload.pop("sha", None)
+                response = self._make_request("PUT", self.api_url, json=payload)
+
             if response.status_code in [200, 201]:
-                logger.info(f"成功上传数据到GitHub: {response.json().get('commit', {}).get('html_url', '')}")
+                result = response.json()
+                self._cached_sha = (result.get("content") or {}).get("sha") or self._cached_sha
+                self._last_upload_digest = digest
+                logger.info(f"成功上传数据到GitHub: {result.get('commit', {}).get('html_url', '')}")
                 return True
             else:
                 logger.error(f"上传到GitHub失败: HTTP {response.status_code}, {response.text}")
                 return False
-                
+
         except Exception as e:
             logger.error(f"上传数据到GitHub失败: {e}")
             return False
@@ -15,24 +15,23 @@ logger = logging.getLogger(__name__)
 
 async def migrate_database_schema():
     """迁移数据库模式"""
-    
+
     try:
         await db_manager.initialize()
-        
-        async with db_manager.get_session() as session:
-            # 检查用户表是否存在
-            users_table_check = await session.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'users'
-                );
-            """))
-            users_table_exists = users_table_check.scalar()
-            
-            if not users_table_exists:
-                logger.info("创建用户表...")
-                await session.execute(text("""
-                    CREATE TABLE users (
+
+        # 整个迁移共用一条Core连接和一个隐式事务（begin()退出时提交、
+        # 异常时回滚）：纯DDL脚本用不上ORM Session的自动flush等簿记开销。
+        # 所有DDL都写成幂等形式（IF NOT EXISTS / 条件块），
+        # 不再需要information_schema存在性探测和Python侧分支
+        async with db_manager.engine.begin() as conn:
+            # users表：不再单独建ix_users_id/ix_users_email——主键和
+            # email的UNIQUE约束各自带隐式索引，重复索引只增加写放大
+            # （asyncpg的预编译协议不接受多语句字符串，DO块是单条语句）
+            logger.info("确保users表存在...")
+            await conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE TABLE IF NOT EXISTS users (
                         id SERIAL PRIMARY KEY,
                         username VARCHAR(50) NOT NULL,
                         email VARCHAR(100) UNIQUE NOT NULL,
@@ -42,77 +41,55 @@ async def migrate_database_schema():
                         CONSTRAINT username_min_length CHECK (LENGTH(TRIM(username)) >= 2),
                         CONSTRAINT email_not_empty CHECK (LENGTH(TRIM(email)) > 0)
                     );
-                """))
-                
-                # 创建索引
-                await session.execute(text("CREATE INDEX ix_users_id ON users (id);"))
-                await session.execute(text("CREATE INDEX ix_users_email ON users (email);"))
-                logger.info("✅ 用户表创建成功")
-            else:
-                logger.info("✅ 用户表已存在")
-            
-            # 检查games表的user_id列是否存在
-            games_user_id_check = await session.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.columns 
-                    WHERE table_name = 'games' AND column_name = 'user_id'
-                );
+                END
+                $$;
             """))
-            games_user_id_exists = games_user_id_check.scalar()
-            
-            if not games_user_id_exists:
-                logger.info("为games表添加user_id列...")
-                
-                # 创建默认用户（如果需要）
-                default_user_check = await session.execute(text("""
-                    SELECT id FROM users WHERE email = 'default@gametracker.com' LIMIT 1;
-                """))
-                default_user_id = default_user_check.scalar()
-                
-                if not default_user_id:
-                    logger.info("创建默认用户...")
-                    result = await session.execute(text("""
-                        INSERT INTO users (username, email, password_hash) 
-                        VALUES ('default_user', 'default@gametracker.com', '$2b$12$defaulthash') 
-                        RETURNING id;
-                    """))
-                    default_user_id = result.scalar()
-                    logger.info(f"✅ 默认用户创建成功，ID: {default_user_id}")
-                
-                # 添加user_id列
-                await session.execute(text(f"""
-                    ALTER TABLE games ADD COLUMN user_id INTEGER NOT NULL DEFAULT {default_user_id};
-                """))
-                
-                # 添加外键约束
-                await session.execute(text("""
-                    ALTER TABLE games ADD CONSTRAINT fk_games_user_id 
-                    FOREIGN KEY (user_id) REFERENCES users(id);
-                """))
-                
-                # 创建索引
-                await session.execute(text("CREATE INDEX ix_games_user_id ON games (user_id);"))
-                logger.info("✅ games表user_id列添加成功")
-            else:
-                logger.info("✅ games表已有user_id列")
-            
-            # 检查books表是否存在以及user_id列
-            books_table_check = await session.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'books'
-                );
+
+            # 默认用户id供games/books的加列DEFAULT使用，一次upsert+RETURNING获取
+            # （DO UPDATE SET email=EXCLUDED.email让RETURNING在冲突时也返回行）
+            result = await conn.execute(text("""
+                INSERT INTO users (username, email, password_hash)
+                VALUES ('default_user', 'default@gametracker.com', '$2b$12$defaulthash')
+                ON CONFLICT (email) DO UPDATE SET email = EXCLUDED.email
+                RETURNING id;
             """))
-            books_table_exists = books_table_check.scalar()
-            
-            if not books_table_exists:
-                logger.info("创建books表...")
-                await session.execute(text("""
-                    CREATE TYPE bookstatus AS ENUM ('reading', 'paused', 'reference', 'planned', 'finished', 'dropped');
-                """))
-                
-                await session.execute(text("""
-                    CREATE TABLE books (
+            # ALTER TABLE等工具语句不支持绑定参数，DEFAULT值只能内插到SQL里；
+            # 先强转int，杜绝任何非数字内容进入语句文本
+            default_user_id = int(result.scalar())
+            logger.info(f"默认用户ID: {default_user_id}")
+
+            # games表的user_id列：非阻塞DDL（PG11+常量默认值加列只改元数据，
+            # 外键NOT VALID不做全表扫描验证），列/约束存在时整块是无操作；
+            # 索引创建和约束验证延后到提交之后CONCURRENTLY执行，
+            # 避免ACCESS EXCLUSIVE锁长时间阻塞线上流量
+            logger.info("确保games表有user_id列...")
+            await conn.execute(text(f"""
+                DO $$
+                BEGIN
+                    ALTER TABLE games ADD COLUMN IF NOT EXISTS user_id INTEGER NOT NULL DEFAULT {default_user_id};
+                    IF NOT EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = 'games'::regclass AND contype = 'f'
+                    ) THEN
+                        ALTER TABLE games ADD CONSTRAINT fk_games_user_id
+                        FOREIGN KEY (user_id) REFERENCES users(id) NOT VALID;
+                    END IF;
+                    -- created_at单调递增，BRIN体积小、写入开销可忽略（同books表）
+                    CREATE INDEX IF NOT EXISTS ix_games_created_at_brin ON games USING BRIN (created_at);
+                END
+                $$;
+            """))
+
+            # books表：类型+建表+索引一个DO块；表已存在时补user_id列和外键
+            logger.info("确保books表存在且有user_id列...")
+            await conn.execute(text(f"""
+                DO $$
+                BEGIN
+                    BEGIN
+                        CREATE TYPE bookstatus AS ENUM ('reading', 'paused', 'reference', 'planned', 'finished', 'dropped');
+                    EXCEPTION WHEN duplicate_object THEN NULL;
+                    END;
+                    CREATE TABLE IF NOT EXISTS books (
                         id SERIAL PRIMARY KEY,
                         user_id INTEGER NOT NULL REFERENCES users(id),
                         title VARCHAR(200) NOT NULL,
@@ -126,51 +103,32 @@ async def migrate_database_schema():
                         ended_at TIMESTAMP WITH TIME ZONE,
                         CONSTRAINT books_rating_range CHECK (rating >= 0 AND rating <= 10)
                     );
-                """))
-                
-                # 创建索引
-                await session.execute(text("CREATE INDEX ix_books_id ON books (id);"))
-                await session.execute(text("CREATE INDEX ix_books_user_id ON books (user_id);"))
-                await session.execute(text("CREATE INDEX ix_books_title ON books (title);"))
-                await session.execute(text("CREATE INDEX ix_books_status ON books (status);"))
-                logger.info("✅ books表创建成功")
-            else:
-                # 检查books表的user_id列
-                books_user_id_check = await session.execute(text("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.columns 
-                        WHERE table_name = 'books' AND column_name = 'user_id'
-                    );
-                """))
-                books_user_id_exists = books_user_id_check.scalar()
-                
-                if not books_user_id_exists:
-                    logger.info("为books表添加user_id列...")
-                    await session.execute(text(f"""
-                        ALTER TABLE books ADD COLUMN user_id INTEGER NOT NULL DEFAULT {default_user_id};
-                    """))
-                    await session.execute(text("""
-                        ALTER TABLE books ADD CONSTRAINT fk_books_user_id 
-                        FOREIGN KEY (user_id) REFERENCES users(id);
-                    """))
-                    await session.execute(text("CREATE INDEX ix_books_user_id ON books (user_id);"))
-                    logger.info("✅ books表user_id列添加成功")
-                else:
-                    logger.info("✅ books表已有user_id列")
-            
-            # 检查settings表
-            settings_table_check = await session.execute(text("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'settings'
-                );
+                    CREATE INDEX IF NOT EXISTS ix_books_id ON books (id);
+                    CREATE INDEX IF NOT EXISTS ix_books_title ON books (title);
+                    CREATE INDEX IF NOT EXISTS ix_books_status ON books (status);
+                    -- created_at/ended_at单调递增，BRIN按页区间汇总，
+                    -- 体积只有btree的千分之一量级，写入几乎无额外开销，
+                    -- 足以支撑"最近活动"类按时间过滤的查询
+                    CREATE INDEX IF NOT EXISTS ix_books_created_at_brin ON books USING BRIN (created_at);
+                    CREATE INDEX IF NOT EXISTS ix_books_ended_at_brin ON books USING BRIN (ended_at);
+                    ALTER TABLE books ADD COLUMN IF NOT EXISTS user_id INTEGER NOT NULL DEFAULT {default_user_id};
+                    IF NOT EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = 'books'::regclass AND contype = 'f'
+                    ) THEN
+                        ALTER TABLE books ADD CONSTRAINT fk_books_user_id
+                        FOREIGN KEY (user_id) REFERENCES users(id) NOT VALID;
+                    END IF;
+                END
+                $$;
             """))
-            settings_table_exists = settings_table_check.scalar()
-            
-            if not settings_table_exists:
-                logger.info("创建settings表...")
-                await session.execute(text("""
-                    CREATE TABLE settings (
+
+            # settings表
+            logger.info("确保settings表存在...")
+            await conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE TABLE IF NOT EXISTS settings (
                         id SERIAL PRIMARY KEY,
                         user_id INTEGER NOT NULL REFERENCES users(id),
                         key VARCHAR(50) NOT NULL,
@@ -178,23 +136,47 @@ async def migrate_database_schema():
                         created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
                         UNIQUE(user_id, key)
                     );
-                """))
-                
-                await session.execute(text("CREATE INDEX ix_settings_id ON settings (id);"))
-                await session.execute(text("CREATE INDEX ix_settings_user_id ON settings (user_id);"))
-                logger.info("✅ settings表创建成功")
-            else:
-                logger.info("✅ settings表已存在")
-            
-            await session.commit()
-            logger.info("🎉 数据库模式迁移完成!")
-            
+                    CREATE INDEX IF NOT EXISTS ix_settings_id ON settings (id);
+                    CREATE INDEX IF NOT EXISTS ix_settings_user_id ON settings (user_id);
+                END
+                $$;
+            """))
+
+        # 提交之后再跑CONCURRENTLY索引和约束验证：
+        # CONCURRENTLY不能在事务内执行，且需等待持锁事务结束，
+        # 所以用独立的AUTOCOMMIT连接，每条语句立即生效；
+        # 全部语句自身幂等（IF NOT EXISTS / 仅验证未验证的约束）
+        post_commit_ddl = [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_games_user_id ON games (user_id);",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_books_user_id ON books (user_id);",
+            """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_constraint
+                           WHERE conname = 'fk_games_user_id' AND NOT convalidated) THEN
+                    ALTER TABLE games VALIDATE CONSTRAINT fk_games_user_id;
+                END IF;
+                IF EXISTS (SELECT 1 FROM pg_constraint
+                           WHERE conname = 'fk_books_user_id' AND NOT convalidated) THEN
+                    ALTER TABLE books VALIDATE CONSTRAINT fk_books_user_id;
+                END IF;
+            END
+            $$;
+            """,
+        ]
+        async with db_manager.engine.connect() as conn:
+            auto_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for statement in post_commit_ddl:
+                await auto_conn.execute(text(statement))
+
+        logger.info("🎉 数据库模式迁移完成!")
+
     except Exception as e:
         logger.error(f"❌ 数据库迁移失败: {str(e)}")
         return False
     finally:
         await db_manager.close()
-    
+
     return True
 
 if __name__ == "__main__":
@@ -203,4 +185,4 @@ if __name__ == "__main__":
         print("✅ 数据库迁移成功完成!")
     else:
         print("❌ 数据库迁移失败!")
-        exit(1)
\ No newline at end of file
+        exit(1)
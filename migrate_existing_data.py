@@ -9,10 +9,24 @@ import asyncio
 import json
 import os
 import logging
+from itertools import islice
 from datetime import datetime
 from typing import Optional
 
-from models import GameCreate, BookCreate, GameStatus, BookStatus
+from sqlalchemy import insert, text
+
+try:
+    import orjson
+except ImportError:  # orjson未安装时回退到标准库json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson未安装时回退到整文件加载
+    ijson = None
+
+from models import GameStatus, BookStatus
+from db_models import GameModel, BookModel
 from user_store import MultiUserStore
 from auth import get_password_hash
 from database import db_manager
@@ -20,6 +34,47 @@ from database import db_manager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _load_json_file(path: str) -> dict:
+    """读取并解析JSON数据文件。orjson对大文件解析快2-5倍且分配更少"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# 每积累多少行就刷一批executemany，内存占用为O(批)而非O(文件)
+_BATCH_SIZE = 1000
+
+# 模块级复用同一个insert()构造：SQLAlchemy 2.0的编译缓存按语句对象命中，
+# 复用实例让每批执行都省掉重新构造/编译语句的开销
+_GAME_INSERT = insert(GameModel)
+_BOOK_INSERT = insert(BookModel)
+
+# BULK_COPY=1时走PostgreSQL的COPY协议批量导入：绕过逐行SQL解析/计划，
+# 超大文件下比executemany再快3-10倍（仅Postgres可用，默认关闭）
+_USE_BULK_COPY = os.getenv("BULK_COPY", "0") == "1"
+
+# 模块级建一次按值查枚举的字典：每行省一次Enum.__call__（含线性扫描）
+_GAME_STATUS_MAP = {s.value: s for s in GameStatus}
+_BOOK_STATUS_MAP = {s.value: s for s in BookStatus}
+
+def _iter_status_items(path: str, top_key: str):
+    """惰性迭代 {top_key: {status: [item, ...]}} 结构，产出(status, item)对
+
+    有ijson时流式解析，不把整个文件读入内存，且解析可与数据库写入交叠；
+    否则回退到整文件加载后再迭代。
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            for status, items in ijson.kvitems(f, top_key):
+                for item in items:
+                    yield status, item
+    else:
+        data = _load_json_file(path)
+        for status, items in data.get(top_key, {}).items():
+            for item in items:
+                yield status, item
+
 class DataMigrator:
     """数据迁移器"""
     
@@ -38,19 +93,29 @@ class DataMigrator:
         
         # 初始化数据库
         await db_manager.initialize()
-        await db_manager.create_tables()
+        # create_tables会为每张表发一次存在性检查往返；脚本通常跑在
+        # 已就绪的库上，先用一次to_regclass探测，表已在则整个建表过程跳过
+        async with db_manager.engine.connect() as conn:
+            users_missing = (await conn.execute(
+                text("SELECT to_regclass('public.users') IS NULL")
+            )).scalar()
+        if users_missing:
+            await db_manager.create_tables()
+        else:
+            logger.info("数据库表已存在，跳过建表")
         
         try:
             # 1. 创建或获取用户
             user = await self._get_or_create_user(user_email, user_password, username)
             logger.info(f"用户准备完毕: {user.username} ({user.email})")
             
-            # 2. 迁移游戏数据
-            games_migrated = await self._migrate_games(user.id)
+            # 2/3. 游戏和书籍写入不同的表、各用自己的会话，没有数据依赖，
+            # 并发执行后总耗时约等于两者中较慢的一个（连接池≥2即可）
+            games_migrated, books_migrated = await asyncio.gather(
+                self._migrate_games(user.id),
+                self._migrate_books(user.id)
+            )
             logger.info(f"游戏数据迁移完成: {games_migrated} 个游戏")
-            
-            # 3. 迁移书籍数据
-            books_migrated = await self._migrate_books(user.id)
             logger.info(f"书籍数据迁移完成: {books_migrated} 本书籍")
             
             logger.info("✅ 数据迁移成功完成！")
@@ -87,7 +152,9 @@ class DataMigrator:
             email=email,
             password=password
         )
-        password_hash = get_password_hash(password)
+        # bcrypt哈希约250ms且是纯CPU操作，放到线程池执行避免阻塞事件循环
+        # （bcrypt的C实现会释放GIL，线程里真正并行）
+        password_hash = await asyncio.to_thread(get_password_hash, password)
         user = await self.user_store.create_user(user_data, password_hash)
         logger.info(f"新用户创建成功: {email}")
         return user
@@ -100,36 +167,55 @@ class DataMigrator:
             return 0
         
         try:
-            with open(games_file, 'r', encoding='utf-8') as f:
-                games_data = json.load(f)
-            
+            # 流式解析+分批executemany写入：边解析边入库，
+            # N次INSERT往返减为N/批次，内存占用与文件大小无关。
+            # 每批用一个推导式构造（方法查找提为局部变量）：
+            # 行构造没有可失败的操作（.get不抛异常、状态转换自带回退），
+            # 去掉逐行try/except后省下可观的解释器开销
             migrated_count = 0
-            
-            # 遍历所有状态的游戏
-            for status, games_list in games_data.get('games', {}).items():
-                for game_data in games_list:
-                    try:
-                        # 转换状态枚举
-                        game_status = self._convert_game_status(status)
-                        
-                        # 创建游戏对象
-                        game_create = GameCreate(
-                            name=game_data.get('name', ''),
-                            status=game_status,
-                            notes=game_data.get('notes', ''),
-                            rating=game_data.get('rating'),
-                            reason=game_data.get('reason', '')
-                        )
-                        
-                        # 添加到用户账户
-                        await self.user_store.add_game(user_id, game_create)
-                        migrated_count += 1
-                        logger.debug(f"迁移游戏: {game_data.get('name')}")
-                        
-                    except Exception as e:
-                        logger.error(f"迁移游戏失败 {game_data.get('name', 'Unknown')}: {str(e)}")
-                        continue
-            
+            items = _iter_status_items(games_file, 'games')
+            convert = self._convert_game_status
+
+            if _USE_BULK_COPY:
+                # COPY路径：按批组装元组直接走COPY FROM STDIN。
+                # 状态列写入枚举的.name，与SQLAlchemy Enum的持久化规则一致
+                while True:
+                    records = [
+                        (user_id, g.get('name', ''), convert(status).name,
+                         g.get('notes', ''), g.get('rating'), g.get('reason', ''))
+                        for status, g in islice(items, _BATCH_SIZE)
+                    ]
+                    if not records:
+                        break
+                    await db_manager.copy_records_to_table(
+                        'games', records,
+                        ['user_id', 'name', 'status', 'notes', 'rating', 'reason']
+                    )
+                    migrated_count += len(records)
+                    # %s占位的懒格式化：日志级别不够时连字符串拼接都不发生
+                    logger.info("已迁移 %d 个游戏", migrated_count)
+                return migrated_count
+
+            async with db_manager.get_session() as session:
+                while True:
+                    batch = [
+                        {
+                            "user_id": user_id,
+                            "name": g.get('name', ''),
+                            "status": convert(status),
+                            "notes": g.get('notes', ''),
+                            "rating": g.get('rating'),
+                            "reason": g.get('reason', '')
+                        }
+                        for status, g in islice(items, _BATCH_SIZE)
+                    ]
+                    if not batch:
+                        break
+                    await session.execute(_GAME_INSERT, batch)
+                    await session.commit()
+                    migrated_count += len(batch)
+                    logger.info("已迁移 %d 个游戏", migrated_count)
+
             return migrated_count
             
         except Exception as e:
@@ -144,38 +230,53 @@ class DataMigrator:
             return 0
         
         try:
-            with open(books_file, 'r', encoding='utf-8') as f:
-                books_data = json.load(f)
-            
+            # 同游戏迁移：流式解析+分批executemany，每批一个推导式构造
             migrated_count = 0
-            
-            # 遍历所有状态的书籍
-            for status, books_list in books_data.get('books', {}).items():
-                for book_data in books_list:
-                    try:
-                        # 转换状态枚举
-                        book_status = self._convert_book_status(status)
-                        
-                        # 创建书籍对象
-                        book_create = BookCreate(
-                            title=book_data.get('title', ''),
-                            author=book_data.get('author', ''),
-                            status=book_status,
-                            notes=book_data.get('notes', ''),
-                            rating=book_data.get('rating'),
-                            reason=book_data.get('reason', ''),
-                            progress=book_data.get('progress', '')
-                        )
-                        
-                        # 添加到用户账户
-                        await self.user_store.add_book(user_id, book_create)
-                        migrated_count += 1
-                        logger.debug(f"迁移书籍: {book_data.get('title')}")
-                        
-                    except Exception as e:
-                        logger.error(f"迁移书籍失败 {book_data.get('title', 'Unknown')}: {str(e)}")
-                        continue
-            
+            items = _iter_status_items(books_file, 'books')
+            convert = self._convert_book_status
+
+            if _USE_BULK_COPY:
+                # 同游戏迁移：COPY FROM STDIN批量导入
+                while True:
+                    records = [
+                        (user_id, b.get('title', ''), b.get('author', ''),
+                         convert(status).name, b.get('notes', ''), b.get('rating'),
+                         b.get('reason', ''), b.get('progress', ''))
+                        for status, b in islice(items, _BATCH_SIZE)
+                    ]
+                    if not records:
+                        break
+                    await db_manager.copy_records_to_table(
+                        'books', records,
+                        ['user_id', 'title', 'author', 'status', 'notes',
+                         'rating', 'reason', 'progress']
+                    )
+                    migrated_count += len(records)
+                    logger.info("已迁移 %d 本书籍", migrated_count)
+                return migrated_count
+
+            async with db_manager.get_session() as session:
+                while True:
+                    batch = [
+                        {
+                            "user_id": user_id,
+                            "title": b.get('title', ''),
+                            "author": b.get('author', ''),
+                            "status": convert(status),
+                            "notes": b.get('notes', ''),
+                            "rating": b.get('rating'),
+                            "reason": b.get('reason', ''),
+                            "progress": b.get('progress', '')
+                        }
+                        for status, b in islice(items, _BATCH_SIZE)
+                    ]
+                    if not batch:
+                        break
+                    await session.execute(_BOOK_INSERT, batch)
+                    await session.commit()
+                    migrated_count += len(batch)
+                    logger.info("已迁移 %d 本书籍", migrated_count)
+
             return migrated_count
             
         except Exception as e:
@@ -183,28 +284,12 @@ class DataMigrator:
             return 0
     
     def _convert_game_status(self, status_str: str) -> GameStatus:
-        """转换游戏状态字符串为枚举"""
-        status_mapping = {
-            'active': GameStatus.ACTIVE,
-            'paused': GameStatus.PAUSED,
-            'casual': GameStatus.CASUAL,
-            'planned': GameStatus.PLANNED,
-            'finished': GameStatus.FINISHED,
-            'dropped': GameStatus.DROPPED
-        }
-        return status_mapping.get(status_str, GameStatus.ACTIVE)
-    
+        """转换游戏状态字符串为枚举（模块级字典查找），未知值回退到ACTIVE"""
+        return _GAME_STATUS_MAP.get(status_str, GameStatus.ACTIVE)
+
     def _convert_book_status(self, status_str: str) -> BookStatus:
-        """转换书籍状态字符串为枚举"""
-        status_mapping = {
-            'reading': BookStatus.READING,
-            'paused': BookStatus.PAUSED,
-            'reference': BookStatus.REFERENCE,
-            'planned': BookStatus.PLANNED,
-            'finished': BookStatus.FINISHED,
-            'dropped': BookStatus.DROPPED
-        }
-        return status_mapping.get(status_str, BookStatus.READING)
+        """转换书籍状态字符串为枚举（模块级字典查找），未知值回退到READING"""
+        return _BOOK_STATUS_MAP.get(status_str, BookStatus.READING)
 
 async def main():
     """主迁移函数"""
@@ -5,20 +5,42 @@
 
 import asyncio
 import json
+import mmap
 import os
 import logging
 from datetime import datetime
 from pathlib import Path
 
+try:
+    # uvloop与asyncpg同源共建，对大量小型DB往返的调度开销明显更低；
+    # uvicorn[standard]在Linux上已带uvloop，Windows等平台回退默认循环
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # orjson未安装时回退到标准库json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson未安装时回退到整文件加载
+    ijson = None
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# BULK_COPY=1时走PostgreSQL的COPY协议导入games：一条流式语句摊销全部
+# 协议开销，绕过逐行SQL解析，是Postgres最快的批量写入路径
+_USE_BULK_COPY = os.getenv("BULK_COPY", "0") == "1"
+
 # 导入项目模块
-from database import db_manager, initialize_settings
-from db_models import GameModel, SettingsModel
+import asyncpg
+
+from database import db_manager
 from models import GameStatus
-from sqlalchemy import text
 
 async def migrate_json_to_database():
     """将JSON数据迁移到数据库"""
@@ -32,146 +54,226 @@ async def migrate_json_to_database():
     try:
         # 读取JSON数据
         logger.info("📖 读取JSON数据...")
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        games_data = data.get("games", {})
-        next_id = data.get("next_id", 1)
-        limit = data.get("limit", 5)
-        
-        logger.info(f"发现 {len(games_data)} 个游戏，下一个ID: {next_id}，限制: {limit}")
-        
-        # 初始化数据库连接
+        if ijson is not None:
+            # next_id/limit是顶层小标量，各用一次轻量扫描读出；
+            # games字典则用kvitems按键流式迭代，
+            # 峰值内存与文件大小无关（解析与行构造交叠进行）
+            with open(json_file, 'rb') as f:
+                next_id = int(next(ijson.items(f, 'next_id'), 1))
+            with open(json_file, 'rb') as f:
+                limit = int(next(ijson.items(f, 'limit'), 5))
+
+            def _iter_games():
+                with open(json_file, 'rb') as f:
+                    yield from ijson.kvitems(f, 'games')
+
+            games_items = _iter_games()
+        else:
+            # 回退路径：mmap直接映射文件内容，跳过TextIO的缓冲拷贝和
+            # 逐块解码，对较大的games_data.json读取更快
+            with open(json_file, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    data = {}
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # orjson对大文件解析快2-5倍且分配更少
+                        raw = mm[:]
+                        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+            next_id = data.get("next_id", 1)
+            limit = data.get("limit", 5)
+            games_items = iter(data.get("games", {}).items())
+
+        # 在连接数据库之前把全部行解析好：事务只包住纯DB操作，
+        # 不让Python侧的解析时间拉长事务持锁窗口
+        logger.info("🎮 解析游戏数据...")
+        # 热循环里把方法查找提为局部变量（rows.append每行省一次属性查找）；
+        # 时间戳整条链路保持ISO字符串，默认路径交由Postgres在C层解析，
+        # Python侧完全不做字符串->datetime转换（COPY分支才按需转）；
+        # 缺created_at的行共用同一个默认时间，不必每行再取now()
+        rows = []
+        rows_append = rows.append
+        default_created = datetime.now().isoformat()
+        max_id = 0
+        # 按值查枚举建一次字典：省去每行一次Enum.__call__（含线性扫描）；
+        # 未知状态触发KeyError，与原来的ValueError一样落入异常分支
+        status_map = {s.value: s for s in GameStatus}
+        for game_id_str, game_data in games_items:
+            try:
+                g_get = game_data.get
+                created_raw = g_get('created_at')
+                ended_raw = g_get('ended_at')
+                game_id = int(game_id_str)
+                # 同一遍循环里顺手记下最大ID，免去装载后再整体扫一遍
+                if game_id > max_id:
+                    max_id = game_id
+
+                rows_append({
+                    "id": game_id,
+                    "name": game_data['name'],
+                    "status": status_map[game_data['status']],
+                    "notes": g_get('notes', ''),
+                    "rating": g_get('rating'),
+                    "reason": g_get('reason', ''),
+                    "created_at": created_raw or default_created,
+                    "ended_at": ended_raw or None
+                })
+
+            except Exception as e:
+                logger.error(f"❌ 迁移游戏 {game_id_str} 失败: {e}")
+                continue
+
+        logger.info(f"发现 {len(rows)} 个游戏，下一个ID: {next_id}，限制: {limit}")
+
+        # 建表仍走SQLAlchemy——表结构的唯一权威定义在db_models里
         logger.info("🔗 连接到数据库...")
         await db_manager.initialize()
-        
-        # 创建数据库表
-        logger.info("📊 创建数据库表...")
-        await db_manager.create_tables()
-        
-        # 获取数据库会话
-        async with db_manager.get_session() as session:
-            # 初始化设置表
-            logger.info("⚙️ 初始化设置...")
-            await initialize_settings(session)
-            
-            # 更新游戏限制设置
-            settings_query = await session.execute(
-                text("SELECT id FROM settings WHERE key = 'active_game_limit'")
-            )
-            settings_result = settings_query.first()
-            
-            if settings_result:
-                await session.execute(
-                    text("UPDATE settings SET value = :value WHERE key = 'active_game_limit'"),
-                    {"value": str(limit)}
+        try:
+            logger.info("📊 创建数据库表...")
+            await db_manager.create_tables()
+        finally:
+            await db_manager.close()
+
+        # 数据迁移本身直连asyncpg：一次性脚本用不上ORM，
+        # 绕开SQLAlchemy的语句编译、结果缓冲和身份映射，
+        # 每条语句只剩驱动本身的开销
+        dsn = os.environ["DATABASE_URL"].replace("postgresql+asyncpg://", "postgresql://")
+        conn = await asyncpg.connect(dsn)
+        try:
+            # 连接检查折叠进迁移自己的连接：不再为SELECT version()
+            # 单独走一轮TCP+TLS握手和startup流程
+            version = await conn.fetchval("SELECT version()")
+            logger.info(f"✅ 数据库连接成功! PostgreSQL版本: {version}")
+
+            migrated_count = len(rows)
+
+            # 整个迁移一个事务：失败整体回滚，无半成品状态；
+            # SET LOCAL只在本事务生效，关闭同步提交省掉提交时的WAL fsync
+            async with conn.transaction():
+                await conn.execute("SET LOCAL synchronous_commit = off")
+
+                # 更新游戏限制设置
+                settings_row = await conn.fetchrow(
+                    "SELECT id FROM settings WHERE key = 'active_game_limit'"
                 )
-                logger.info(f"✅ 更新游戏限制为: {limit}")
-            
-            # 清空现有游戏数据（如果有的话）
-            await session.execute(text("DELETE FROM games"))
-            logger.info("🗑️ 清空现有游戏数据")
-            
-            # 迁移游戏数据
-            logger.info("🎮 开始迁移游戏数据...")
-            migrated_count = 0
-            
-            for game_id_str, game_data in games_data.items():
-                try:
-                    game_id = int(game_id_str)
-                    
-                    # 解析时间戳
-                    created_at = None
-                    if game_data.get('created_at'):
-                        created_at = datetime.fromisoformat(game_data['created_at'])
-                    
-                    ended_at = None
-                    if game_data.get('ended_at'):
-                        ended_at = datetime.fromisoformat(game_data['ended_at'])
-                    
-                    # 创建游戏对象
-                    game = GameModel(
-                        id=game_id,
-                        name=game_data['name'],
-                        status=GameStatus(game_data['status']),
-                        notes=game_data.get('notes', ''),
-                        rating=game_data.get('rating'),
-                        reason=game_data.get('reason', ''),
-                        created_at=created_at or datetime.now(),
-                        ended_at=ended_at
+                if settings_row:
+                    await conn.execute(
+                        "UPDATE settings SET value = $1 WHERE key = 'active_game_limit'",
+                        int(limit)
                     )
-                    
-                    session.add(game)
-                    migrated_count += 1
-                    logger.info(f"✅ 迁移游戏: [{game_id}] {game_data['name']} - {game_data['status']}")
-                    
-                except Exception as e:
-                    logger.error(f"❌ 迁移游戏 {game_id_str} 失败: {e}")
-                    continue
-            
-            # 更新序列的下一个值
-            if migrated_count > 0:
-                max_id = max(int(gid) for gid in games_data.keys())
-                new_next_id = max(max_id + 1, next_id)
-                
-                # 重置序列
-                await session.execute(
-                    text(f"SELECT setval('games_id_seq', {new_next_id}, false)")
-                )
-                logger.info(f"🔢 设置下一个游戏ID为: {new_next_id}")
-            
-            # 提交事务
-            await session.commit()
+                    logger.info(f"✅ 更新游戏限制为: {limit}")
+
+                # 清空现有游戏数据（如果有的话）
+                await conn.execute("DELETE FROM games")
+                logger.info("🗑️ 清空现有游戏数据")
+
+                # 装载前删掉games的二级索引、装载完再重建：批量写入时逐行
+                # 维护B-tree远慢于装载后一次性排序建索引。PK/UNIQUE索引
+                # 保留（承载约束）；不用ALTER TABLE SET UNLOGGED——
+                # games带外键引用users，Postgres拒绝对其取消日志
+                secondary_indexes = await conn.fetch("""
+                    SELECT indexname, indexdef FROM pg_indexes
+                    WHERE schemaname = 'public' AND tablename = 'games'
+                      AND indexname NOT IN (
+                          SELECT c.relname
+                          FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                          WHERE i.indisprimary OR i.indisunique
+                      )
+                """)
+                for idx in secondary_indexes:
+                    await conn.execute(f'DROP INDEX "{idx["indexname"]}"')
+                if secondary_indexes:
+                    logger.info("暂时移除 %d 个二级索引", len(secondary_indexes))
+
+                # 迁移游戏数据：行已在连接前解析完毕。
+                # 默认把整个载荷作为一个JSON参数发给服务器，由
+                # json_populate_recordset在C层展开成行——一次往返、
+                # 客户端零逐行迭代（ON CONFLICT保证重跑幂等）；
+                # BULK_COPY=1时走COPY协议——同连接同事务内，DELETE可见
+                logger.info("🎮 开始迁移游戏数据...")
+                if rows and _USE_BULK_COPY:
+                    # 状态列写入枚举的.name，与SQLAlchemy Enum的持久化规则
+                    # 一致；user_id不在列清单里，由数据库列默认值填充。
+                    # 二进制COPY需要真正的datetime，只在这条分支上转换
+                    from_iso = datetime.fromisoformat
+                    records = [
+                        (r["id"], r["name"], r["status"].name, r["notes"],
+                         r["rating"], r["reason"], from_iso(r["created_at"]),
+                         from_iso(r["ended_at"]) if r["ended_at"] else None)
+                        for r in rows
+                    ]
+                    await conn.copy_records_to_table(
+                        'games', records=records,
+                        columns=['id', 'name', 'status', 'notes', 'rating',
+                                 'reason', 'created_at', 'ended_at']
+                    )
+                elif rows:
+                    # 时间戳原样透传ISO字符串，由Postgres解析；状态用枚举.name
+                    payload = [
+                        {"id": r["id"], "name": r["name"],
+                         "status": r["status"].name, "notes": r["notes"],
+                         "rating": r["rating"], "reason": r["reason"],
+                         "created_at": r["created_at"],
+                         "ended_at": r["ended_at"]}
+                        for r in rows
+                    ]
+                    body = (orjson.dumps(payload).decode()
+                            if orjson is not None else json.dumps(payload))
+                    await conn.execute(
+                        "INSERT INTO games (id, name, status, notes, rating,"
+                        " reason, created_at, ended_at)"
+                        " SELECT id, name, status, notes, rating, reason,"
+                        " created_at, ended_at"
+                        " FROM json_populate_recordset(null::games, $1::json)"
+                        " ON CONFLICT (id) DO NOTHING",
+                        body
+                    )
+
+                # 装载完成，按原定义重建二级索引
+                for idx in secondary_indexes:
+                    await conn.execute(idx["indexdef"])
+                if secondary_indexes:
+                    logger.info("重建 %d 个二级索引", len(secondary_indexes))
+
+                # 更新序列的下一个值（max_id已在解析循环中一趟算出）
+                if migrated_count > 0:
+                    new_next_id = max(max_id + 1, next_id)
+                    await conn.execute(
+                        "SELECT setval('games_id_seq', $1, false)", new_next_id
+                    )
+                    logger.info(f"🔢 设置下一个游戏ID为: {new_next_id}")
+
             logger.info(f"💾 成功迁移 {migrated_count} 个游戏到数据库！")
-            
-            # 验证数据
+
+            # 验证数据：总数和状态分布用一条ROLLUP查询拿到（NULL行是总计），
+            # 比"COUNT(*)再GROUP BY"少一次往返和一次全表扫描。
+            # 注意不能用pg_class.reltuples估算——批量写入后统计信息尚未更新
             logger.info("🔍 验证迁移结果...")
-            result = await session.execute(text("SELECT COUNT(*) FROM games"))
-            db_count = result.scalar()
-            logger.info(f"数据库中游戏总数: {db_count}")
-            
-            # 按状态统计
-            status_stats = await session.execute(text("""
-                SELECT status, COUNT(*) as count 
-                FROM games 
-                GROUP BY status 
-                ORDER BY status
-            """))
-            
+            status_stats = await conn.fetch("""
+                SELECT status, COUNT(*) as count
+                FROM games
+                GROUP BY ROLLUP(status)
+                ORDER BY status NULLS LAST
+            """)
+
             logger.info("📊 游戏状态分布:")
             for row in status_stats:
-                logger.info(f"  {row.status}: {row.count}个")
-        
+                if row['status'] is None:
+                    logger.info(f"数据库中游戏总数: {row['count']}")
+                else:
+                    logger.info(f"  {row['status']}: {row['count']}个")
+        finally:
+            await conn.close()
+
         logger.info("🎉 数据迁移完成！")
         return True
-        
+
     except Exception as e:
         logger.error(f"💥 迁移失败: {e}")
         import traceback
         traceback.print_exc()
         return False
-    
-    finally:
-        # 关闭数据库连接
-        await db_manager.close()
-
-async def test_database_connection():
-    """测试数据库连接"""
-    try:
-        logger.info("🔍 测试数据库连接...")
-        await db_manager.initialize()
-        
-        async with db_manager.get_session() as session:
-            result = await session.execute(text("SELECT version()"))
-            version = result.scalar()
-            logger.info(f"✅ 数据库连接成功! PostgreSQL版本: {version}")
-            
-        await db_manager.close()
-        return True
-        
-    except Exception as e:
-        logger.error(f"❌ 数据库连接失败: {e}")
-        return False
 
 async def main():
     """主函数"""
@@ -186,12 +288,8 @@ async def main():
         return
     
     print(f"数据库URL: {db_url[:50]}...")
-    
-    # 测试数据库连接
-    if not await test_database_connection():
-        return
-    
-    # 询问用户确认
+
+    # 询问用户确认（连接检查已折叠进迁移流程，失败会在迁移开头报出）
     print("\n警告: 此操作将清空数据库中的现有游戏数据并重新导入JSON数据")
     response = input("确定要继续吗? (y/N): ").lower().strip()
     
@@ -210,4 +308,6 @@ async def main():
         print("\n迁移失败，请检查错误信息并重试。")
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
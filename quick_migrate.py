@@ -48,18 +48,16 @@ async def migrate_for_hero():
             email=USER_EMAIL,
             password=USER_PASSWORD
         )
-        password_hash = get_password_hash(USER_PASSWORD)
-        
-        try:
+        # 先查用户是否存在：bcrypt哈希约250ms的CPU开销，只在真正建用户时才计算，
+        # 脚本幂等重跑时整个哈希步骤被跳过
+        user_model = await user_store.get_user_by_email(USER_EMAIL)
+        if user_model:
+            logger.info("用户已存在，获取现有用户...")
+            user = user_store._user_db_to_pydantic(user_model)
+        else:
+            password_hash = get_password_hash(USER_PASSWORD)
             user = await user_store.create_user(user_data, password_hash)
             logger.info(f"用户创建成功: {user.username}")
-        except Exception as e:
-            if "already exists" in str(e):
-                logger.info("用户已存在，获取现有用户...")
-                user_model = await user_store.get_user_by_email(USER_EMAIL)
-                user = user_store._user_db_to_pydantic(user_model)
-            else:
-                raise e
         
         # 迁移游戏数据
         games_migrated = 0
@@ -17,7 +17,8 @@ class GameStoreAdapter:
         self._store = None
         self._initialize_store()
     
-    def _should_use_database(self) -> bool:
+    @staticmethod
+    def _should_use_database() -> bool:
         """判断是否应该使用数据库模式"""
         # 如果有DATABASE_URL环境变量，使用数据库
         if os.getenv("DATABASE_URL"):
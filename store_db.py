@@ -212,8 +212,9 @@ class DatabaseGameStore:
         
         if exclude_id is not None:
             query = query.where(GameModel.id != exclude_id)
-        
-        result = await session.execute(query)
+
+        # LIMIT 1：存在性检查命中第一行即停
+        result = await session.execute(query.limit(1))
         return result.scalar_one_or_none() is not None
     
     async def _would_create_duplicate_active_name(self, session: AsyncSession, game_id: int, name: str, new_status: GameStatus) -> bool:
@@ -6,7 +6,7 @@
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, insert, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
@@ -86,13 +86,13 @@ class MultiUserStore:
     
     async def _create_default_settings(self, session: AsyncSession, user_id: int):
         """为新用户创建默认设置"""
+        # Core insert+字典列表：一条executemany写入，不构造ORM实例，
+        # 省掉属性插装和unit-of-work簿记（默认值行之后也不会再用到）
         default_settings = [
-            SettingsModel(user_id=user_id, key="game_limit", value=3),
-            SettingsModel(user_id=user_id, key="book_limit", value=3)
+            {"user_id": user_id, "key": "game_limit", "value": 3},
+            {"user_id": user_id, "key": "book_limit", "value": 3}
         ]
-        
-        for setting in default_settings:
-            session.add(setting)
+        await session.execute(insert(SettingsModel), default_settings)
         await session.commit()
     
     # ====================== 游戏管理 ======================
@@ -131,52 +131,70 @@ class MultiUserStore:
     async def get_active_count(self, user_id: int) -> dict:
         """获取用户的活跃游戏计数"""
         async with db_manager.get_session() as session:
-            # 获取各状态游戏数量
-            active_count = await self._get_game_count_by_status(session, user_id, GameStatus.ACTIVE)
-            paused_count = await self._get_game_count_by_status(session, user_id, GameStatus.PAUSED)
-            casual_count = await self._get_game_count_by_status(session, user_id, GameStatus.CASUAL)
-            planned_count = await self._get_game_count_by_status(session, user_id, GameStatus.PLANNED)
-            
+            # 各状态数量一条GROUP BY拿全：4次COUNT往返+4次索引扫描
+            # 合并为1次（idx_games_user_status一趟范围扫描）
+            result = await session.execute(
+                select(GameModel.status, func.count())
+                .where(GameModel.user_id == user_id)
+                .group_by(GameModel.status)
+            )
+            counts = dict(result.all())
+
             # 获取游戏限制
             limit = await self._get_user_setting(session, user_id, "game_limit", 3)
-            
+
             return {
-                "count": active_count,
+                "count": counts.get(GameStatus.ACTIVE, 0),
                 "limit": limit,
-                "paused_count": paused_count,
-                "casual_count": casual_count,
-                "planned_count": planned_count
+                "paused_count": counts.get(GameStatus.PAUSED, 0),
+                "casual_count": counts.get(GameStatus.CASUAL, 0),
+                "planned_count": counts.get(GameStatus.PLANNED, 0)
             }
     
-    async def add_game(self, user_id: int, game_data: GameCreate) -> Game:
-        """添加新游戏"""
+    async def add_game(self, user_id: int, game_data: GameCreate, session=None) -> Game:
+        """添加新游戏
+
+        传入session时复用调用方的会话和事务、不在此处提交（批量导入时
+        N次commit合并为调用方的1次，省掉每行的fsync/WAL刷盘）；
+        否则内部开启会话并立即提交。
+        """
+        if session is not None:
+            return await self._add_game(session, user_id, game_data, commit=False)
         async with db_manager.get_session() as session:
-            # 检查活跃游戏数量限制
-            if game_data.status == GameStatus.ACTIVE:
-                active_count = await self._get_game_count_by_status(session, user_id, GameStatus.ACTIVE)
-                limit = await self._get_user_setting(session, user_id, "game_limit", 3)
-                
-                if active_count >= limit:
-                    raise GameLimitExceededError(limit)
-                
-                # 检查重复游戏名
-                await self._check_duplicate_game_name(session, user_id, game_data.name)
-            
-            # 创建游戏记录
-            db_game = GameModel(
-                user_id=user_id,
-                name=game_data.name,
-                status=game_data.status,
-                notes=game_data.notes,
-                rating=game_data.rating,
-                reason=game_data.reason
-            )
-            
-            session.add(db_game)
+            return await self._add_game(session, user_id, game_data, commit=True)
+
+    async def _add_game(self, session, user_id: int, game_data: GameCreate, commit: bool) -> Game:
+        # 检查活跃游戏数量限制
+        if game_data.status == GameStatus.ACTIVE:
+            active_count = await self._get_game_count_by_status(session, user_id, GameStatus.ACTIVE)
+            limit = await self._get_user_setting(session, user_id, "game_limit", 3)
+
+            if active_count >= limit:
+                raise GameLimitExceededError(limit)
+
+            # 检查重复游戏名
+            await self._check_duplicate_game_name(session, user_id, game_data.name)
+
+        # 创建游戏记录
+        db_game = GameModel(
+            user_id=user_id,
+            name=game_data.name,
+            status=game_data.status,
+            notes=game_data.notes,
+            rating=game_data.rating,
+            reason=game_data.reason
+        )
+
+        session.add(db_game)
+        if commit:
             await session.commit()
-            await session.refresh(db_game)
-            
-            return self._game_db_to_pydantic(db_game)
+        else:
+            # 仅flush把行写入当前事务、拿到自增主键，提交留给调用方
+            await session.flush()
+        # refresh加载created_at等服务端默认值（异步下延迟加载会报错）
+        await session.refresh(db_game)
+
+        return self._game_db_to_pydantic(db_game)
     
     async def update_game(self, user_id: int, game_id: int, updates: GameUpdate) -> Game:
         """更新游戏"""
@@ -261,52 +279,66 @@ class MultiUserStore:
     async def get_reading_count(self, user_id: int) -> dict:
         """获取用户的阅读计数"""
         async with db_manager.get_session() as session:
-            # 获取各状态书籍数量
-            reading_count = await self._get_book_count_by_status(session, user_id, BookStatus.READING)
-            paused_count = await self._get_book_count_by_status(session, user_id, BookStatus.PAUSED)
-            reference_count = await self._get_book_count_by_status(session, user_id, BookStatus.REFERENCE)
-            planned_count = await self._get_book_count_by_status(session, user_id, BookStatus.PLANNED)
-            
+            # 各状态数量一条GROUP BY拿全（同get_active_count）
+            result = await session.execute(
+                select(BookModel.status, func.count())
+                .where(BookModel.user_id == user_id)
+                .group_by(BookModel.status)
+            )
+            counts = dict(result.all())
+
             # 获取阅读限制
             limit = await self._get_user_setting(session, user_id, "book_limit", 3)
-            
+
             return {
-                "count": reading_count,
+                "count": counts.get(BookStatus.READING, 0),
                 "limit": limit,
-                "paused_count": paused_count,
-                "reference_count": reference_count,
-                "planned_count": planned_count
+                "paused_count": counts.get(BookStatus.PAUSED, 0),
+                "reference_count": counts.get(BookStatus.REFERENCE, 0),
+                "planned_count": counts.get(BookStatus.PLANNED, 0)
             }
     
-    async def add_book(self, user_id: int, book_data: BookCreate) -> Book:
-        """添加新书籍"""
+    async def add_book(self, user_id: int, book_data: BookCreate, session=None) -> Book:
+        """添加新书籍
+
+        传入session时复用调用方的会话和事务、不在此处提交（同add_game，
+        批量导入时由调用方统一提交）；否则内部开启会话并立即提交。
+        """
+        if session is not None:
+            return await self._add_book(session, user_id, book_data, commit=False)
         async with db_manager.get_session() as session:
-            # 检查阅读书籍数量限制
-            if book_data.status == BookStatus.READING:
-                reading_count = await self._get_book_count_by_status(session, user_id, BookStatus.READING)
-                limit = await self._get_user_setting(session, user_id, "book_limit", 3)
-                
-                if reading_count >= limit:
-                    from exceptions import GameTrackerException
-                    raise GameTrackerException(f"Cannot exceed reading limit of {limit} books")
-            
-            # 创建书籍记录
-            db_book = BookModel(
-                user_id=user_id,
-                title=book_data.title,
-                author=book_data.author,
-                status=book_data.status,
-                notes=book_data.notes,
-                rating=book_data.rating,
-                reason=book_data.reason,
-                progress=book_data.progress
-            )
-            
-            session.add(db_book)
+            return await self._add_book(session, user_id, book_data, commit=True)
+
+    async def _add_book(self, session, user_id: int, book_data: BookCreate, commit: bool) -> Book:
+        # 检查阅读书籍数量限制
+        if book_data.status == BookStatus.READING:
+            reading_count = await self._get_book_count_by_status(session, user_id, BookStatus.READING)
+            limit = await self._get_user_setting(session, user_id, "book_limit", 3)
+
+            if reading_count >= limit:
+                from exceptions import GameTrackerException
+                raise GameTrackerException(f"Cannot exceed reading limit of {limit} books")
+
+        # 创建书籍记录
+        db_book = BookModel(
+            user_id=user_id,
+            title=book_data.title,
+            author=book_data.author,
+            status=book_data.status,
+            notes=book_data.notes,
+            rating=book_data.rating,
+            reason=book_data.reason,
+            progress=book_data.progress
+        )
+
+        session.add(db_book)
+        if commit:
             await session.commit()
-            await session.refresh(db_book)
-            
-            return self._book_db_to_pydantic(db_book)
+        else:
+            await session.flush()
+        await session.refresh(db_book)
+
+        return self._book_db_to_pydantic(db_book)
     
     async def update_book(self, user_id: int, book_id: int, updates: BookUpdate) -> Book:
         """更新书籍"""
@@ -401,29 +433,39 @@ class MultiUserStore:
         return result.scalar()
     
     async def _get_user_setting(self, session: AsyncSession, user_id: int, key: str, default: int) -> int:
-        """获取用户设置值"""
+        """获取用户设置值
+
+        只取value标量列（不构造ORM对象、不进身份映射），LIMIT 1让
+        执行器命中唯一索引第一行即停。
+        """
         result = await session.execute(
             select(SettingsModel.value)
             .where(and_(SettingsModel.user_id == user_id, SettingsModel.key == key))
+            .limit(1)
         )
         setting = result.scalar_one_or_none()
         return setting if setting is not None else default
     
     async def _check_duplicate_game_name(self, session: AsyncSession, user_id: int, name: str, exclude_id: Optional[int] = None):
-        """检查游戏名是否重复"""
-        query = select(GameModel).where(
+        """检查游戏名是否重复
+
+        存在性检查只取id标量+LIMIT 1：不物化整个ORM实体，部分索引
+        idx_games_user_active_name命中第一行即返回（此前取整实体还会在
+        命中多行重复时误抛MultipleResultsFound）。
+        """
+        query = select(GameModel.id).where(
             and_(
                 GameModel.user_id == user_id,
                 GameModel.name == name,
                 GameModel.status == GameStatus.ACTIVE
             )
         )
-        
+
         if exclude_id:
             query = query.where(GameModel.id != exclude_id)
-        
-        result = await session.execute(query)
-        if result.scalar_one_or_none():
+
+        result = await session.execute(query.limit(1))
+        if result.scalar_one_or_none() is not None:
             raise DuplicateGameError(name)
     
     def _user_db_to_pydantic(self, db_user: UserModel) -> User: